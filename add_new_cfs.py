@@ -1,11 +1,36 @@
 from __future__ import annotations
 
 import csv
-from collections.abc import Sequence
+import functools
+import io
+import re
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain
 from pathlib import Path
 
-from bw2data import Database
-import bw2data as bd
+# Columns every CSV file must contain, in the order they are reported
+_REQUIRED_COLUMNS: Sequence[str] = (
+    "new_database",
+    "flow_name",
+    "code",
+    "unit",
+    "CAS number",
+    "categories",
+    "type",
+    "cf",
+)
+_REQUIRED_COLUMN_SET = frozenset(_REQUIRED_COLUMNS)
+
+# Whitespace replaced by underscores when deriving a code from a flow name
+_CODE_WHITESPACE = (" ", "\t", "\xa0")
+
+# Separator between category segments, absorbing surrounding whitespace
+_CAT_SPLIT = re.compile(r"\s*::\s*")
+
+# Files above this size are read through a larger buffer, to cut read() syscalls
+_LARGE_FILE_SIZE = 4 << 20
+_LARGE_FILE_BUFFERING = 1 << 20
 
 
 def _coerce_to_path(path: str | Path) -> Path:
@@ -27,6 +52,34 @@ def _coerce_to_path(path: str | Path) -> Path:
     return Path(path)
 
 
+def _open_csv(csv_path: Path) -> io.TextIOBase:
+    """
+    Open a CSV file for reading with the csv module.
+
+    Files larger than `_LARGE_FILE_SIZE` are read through a `_LARGE_FILE_BUFFERING`
+    bytes buffer instead of the default one.
+
+    Parameters
+    ----------
+    csv_path:
+        The path to an existing CSV file.
+
+    Returns
+    -------
+    io.TextIOBase
+        A text stream decoding UTF-8 (with optional BOM) without newline translation.
+    """
+    if csv_path.stat().st_size <= _LARGE_FILE_SIZE:
+        return csv_path.open(newline="", encoding="utf-8-sig")
+
+    raw_file = open(csv_path, "rb", buffering=_LARGE_FILE_BUFFERING)
+    try:
+        return io.TextIOWrapper(raw_file, encoding="utf-8-sig", newline="")
+    except BaseException:
+        raw_file.close()
+        raise
+
+
 def _parse_categories(raw: str, *, line_number: int) -> tuple[str, ...]:
     """
     Parse a categories string into a tuple of category segments.
@@ -51,10 +104,13 @@ def _parse_categories(raw: str, *, line_number: int) -> tuple[str, ...]:
     ValueError
         If the categories string is malformed (empty after parsing).
     """
-    if raw.strip() == "":
+    stripped = raw.strip()
+    if not stripped:
         return tuple()
 
-    parts = tuple(segment.strip() for segment in raw.split("::") if segment.strip())
+    # Segments repeat across rows, so they are interned to share one object each;
+    # filter and map run in C, without a generator expression
+    parts = tuple(map(sys.intern, filter(None, _CAT_SPLIT.split(stripped))))
     if not parts:
         raise ValueError(f"Row {line_number}: categories column is malformed.")
 
@@ -63,7 +119,9 @@ def _parse_categories(raw: str, *, line_number: int) -> tuple[str, ...]:
 
 def _sanitize_code(name: str) -> str:
     """
-    Sanitize a flow name to create a code by replacing spaces with underscores.
+    Sanitize a flow name to create a code by replacing whitespace with underscores.
+
+    Spaces, tabs and non-breaking spaces are each replaced by one underscore.
 
     Parameters
     ----------
@@ -73,9 +131,13 @@ def _sanitize_code(name: str) -> str:
     Returns
     -------
     str
-        The sanitized code with spaces replaced by underscores.
+        The sanitized code with whitespace replaced by underscores.
     """
-    return name.strip().replace(" ", "_")
+    # Kept for API parity: the row loop in `_parse_rows` inlines the same replacements
+    code = name.strip()
+    for whitespace in _CODE_WHITESPACE:
+        code = code.replace(whitespace, "_")
+    return code
 
 
 def _parse_cf(raw: str, *, line_number: int) -> float:
@@ -107,6 +169,176 @@ def _parse_cf(raw: str, *, line_number: int) -> float:
         ) from exc
 
 
+def _check_header(header: list[str] | None) -> None:
+    """
+    Check that a CSV header row contains all required columns.
+
+    Parameters
+    ----------
+    header:
+        The header row, or None if the file is empty.
+
+    Raises
+    ------
+    ValueError
+        If the header is missing or if required columns are missing.
+    """
+    if header is None:
+        raise ValueError("CSV file appears to be empty or has no header row.")
+
+    # Hash the (possibly wide) header once instead of scanning it for each column
+    missing = _REQUIRED_COLUMN_SET.difference(header)
+    if missing:
+        missing_columns = [column for column in _REQUIRED_COLUMNS if column in missing]
+        raise ValueError(
+            f"CSV file must contain the following columns: {', '.join(_REQUIRED_COLUMNS)}. "
+            f"Missing: {', '.join(missing_columns)}."
+        )
+
+
+def _parse_rows(
+    reader: Iterable[list[str]], header: list[str]
+) -> Iterator[dict[str, object]]:
+    """
+    Lazily parse the data rows of a CSV file containing new flow definitions.
+
+    Parameters
+    ----------
+    reader:
+        The data rows, as split by `csv.reader`.
+    header:
+        The header row, already checked by `_check_header`.
+
+    Yields
+    ------
+    dict[str, object]
+        One dictionary per row, as described in `parse_new_flows_from_csv`.
+
+    Raises
+    ------
+    ValueError
+        If data cannot be parsed correctly.
+    """
+    # Resolve column positions once instead of looking names up on every row
+    index = {column: position for position, column in enumerate(header)}
+    database_i = index["new_database"]
+    flow_name_i = index["flow_name"]
+    code_i = index["code"]
+    unit_i = index["unit"]
+    cas_number_i = index["CAS number"]
+    categories_i = index["categories"]
+    type_i = index["type"]
+    cf_i = index["cf"]
+    width = len(header)
+
+    # Validate that type is one of the valid Brightway25 values
+    valid_types = {"emission", "natural resource", "process"}
+
+    # Database and unit repeat across rows: interning keeps one string object each
+    intern = sys.intern
+    # Bound once, to avoid a method lookup per field and row
+    strip = str.strip
+
+    # Blank lines are skipped, as csv.DictReader did; start=2 accounts for header line
+    for row_index, row in enumerate(filter(None, reader), start=2):
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+
+        categories = _parse_categories(row[categories_i], line_number=row_index)
+        raw_cf = row[cf_i]
+        # Convert inline on the happy path; _parse_cf only builds the error
+        try:
+            cf = float(raw_cf)
+        except ValueError:
+            cf = _parse_cf(raw_cf, line_number=row_index)
+
+        flow_name = strip(row[flow_name_i])
+        code_raw = strip(row[code_i])
+        code = code_raw
+        if not code:
+            # Same as _sanitize_code(flow_name), inlined; flow_name is already stripped
+            code = flow_name
+            for whitespace in _CODE_WHITESPACE:
+                code = code.replace(whitespace, "_")
+        node_type = strip(row[type_i])
+        if not node_type:
+            raise ValueError(
+                f"Row {row_index}: type column is required and cannot be empty."
+            )
+        if node_type not in valid_types:
+            raise ValueError(
+                f"Row {row_index}: type must be one of {valid_types}, got '{node_type}'."
+            )
+
+        yield {
+            "database": intern(strip(row[database_i])),
+            "name": flow_name,
+            "code": code,
+            "unit": intern(strip(row[unit_i])),
+            "CAS number": strip(row[cas_number_i]),
+            "categories": categories,
+            "type": node_type,
+            "cf": cf,
+        }
+
+
+def _iter_rows(csv_path: Path) -> Iterator[dict[str, object]]:
+    """
+    Lazily parse the rows of a CSV file containing new flow definitions.
+
+    Parameters
+    ----------
+    csv_path:
+        The path to an existing CSV file.
+
+    Yields
+    ------
+    dict[str, object]
+        One dictionary per row, as described in `parse_new_flows_from_csv`.
+
+    Raises
+    ------
+    ValueError
+        If required columns are missing or if data cannot be parsed correctly.
+    """
+    with _open_csv(csv_path) as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        _check_header(header)
+        yield from _parse_rows(reader, header)
+
+
+def parse_new_flows_from_csv_iter(path: str | Path) -> Iterator[dict[str, object]]:
+    """
+    Lazily parse a CSV file containing new flow definitions.
+
+    Same as `parse_new_flows_from_csv`, but rows are parsed and yielded one at a time,
+    so memory use does not grow with the size of the file.
+
+    Parameters
+    ----------
+    path:
+        The path to the CSV file (string or Path object).
+
+    Returns
+    -------
+    Iterator[dict[str, object]]
+        An iterator over one dictionary per row, as described in `parse_new_flows_from_csv`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the CSV file does not exist.
+    ValueError
+        While iterating, if required columns are missing or if data cannot be parsed correctly.
+    """
+    csv_path = _coerce_to_path(path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    return _iter_rows(csv_path)
+
+
 def parse_new_flows_from_csv(path: str | Path) -> list[dict[str, object]]:
     """
     Parse a CSV file containing new flow definitions.
@@ -159,73 +391,128 @@ def parse_new_flows_from_csv(path: str | Path) -> list[dict[str, object]]:
         If required columns are missing or if data cannot be parsed correctly.
     """
 
-    csv_path = _coerce_to_path(path)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    return list(parse_new_flows_from_csv_iter(path))
+
+
+def _db_modified(database_name: str) -> str | None:
+    """
+    Return the last modification timestamp of a database, if it is registered.
+
+    Parameters
+    ----------
+    database_name:
+        The name of the database in the current project.
+
+    Returns
+    -------
+    str | None
+        The "modified" metadata of the database, or None.
+    """
+    import bw2data as bd
+
+    return bd.databases.get(database_name, {}).get("modified")
+
+
+@functools.lru_cache(maxsize=8)
+def _db_index(
+    project_name: str, database_name: str, modified: str | None
+) -> dict[tuple[str, str], int]:
+    """
+    Map the (name, code) of every node of a database to its id, with a single query.
+
+    Cached, so that several CSV files adding CFs for the same database only scan it
+    once. The project name and modification timestamp are part of the cache key, so
+    that writing to the database or switching project invalidates the entry. Use
+    ``_db_index.cache_clear()`` to drop all entries.
+
+    Parameters
+    ----------
+    project_name:
+        The name of the current project.
+    database_name:
+        The name of the database.
+    modified:
+        The modification timestamp of the database, see `_db_modified`.
+
+    Returns
+    -------
+    dict[tuple[str, str], int]
+        The node ids, indexed by (name, code).
+    """
+    from bw2data.backends import ActivityDataset as AD
+
+    query = AD.select(AD.id, AD.name, AD.code).where(AD.database == database_name)
+    return {(node.name, node.code): node.id for node in query}
 
-    required_columns: Sequence[str] = (
-        "new_database",
-        "flow_name",
-        "code",
-        "unit",
-        "CAS number",
-        "categories",
-        "type",
-        "cf",
-    )
-
-    parsed_rows: list[dict[str, object]] = []
-
-    with csv_path.open(newline="", encoding="utf-8-sig") as csv_file:
-        reader = csv.DictReader(csv_file)
-
-        if reader.fieldnames is None:
-            raise ValueError("CSV file appears to be empty or has no header row.")
-
-        missing_columns = [
-            column for column in required_columns if column not in reader.fieldnames
-        ]
-        if missing_columns:
+
+def parse_node_ids_and_cfs_arrays(path: str | Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a CSV file and return node IDs and characterization factors as arrays.
+
+    Same as `parse_node_ids_and_cfs`, but returns two contiguous arrays instead of a
+    list of tuples, so that they can be used to build matrices (e.g. with
+    ``scipy.sparse.coo_matrix``) without iterating over Python objects.
+    Requires Brightway25.
+
+    Parameters
+    ----------
+    path:
+        The path to the CSV file (string or Path object).
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        An int64 array of node ids and a float64 array of CFs, in CSV row order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the CSV file does not exist.
+    ValueError
+        If required columns are missing, if data cannot be parsed correctly,
+        if the database name is missing or invalid, or if a node cannot be found.
+    """
+    # Imported here, so that callers which only parse CSV files do not load Brightway25
+    # or numpy
+    import bw2data as bd
+    import numpy as np
+
+    rows = parse_new_flows_from_csv_iter(path)
+
+    first_row = next(rows, None)
+    if first_row is None:
+        raise ValueError("CSV file is empty (no data rows).")
+
+    database_name = first_row["database"]
+    if not database_name:
+        raise ValueError("Database name is missing in the 'new_database' column.")
+
+    node_ids = _db_index(bd.projects.current, database_name, _db_modified(database_name))
+
+    ids: list[int] = []
+    cfs: list[float] = []
+
+    # start=2 accounts for header line
+    for row_index, row in enumerate(chain((first_row,), rows), start=2):
+        # Verify database name is consistent
+        row_database = row["database"]
+        # Database names are interned, so the identity test is the fast path
+        if row_database is not database_name and row_database != database_name:
             raise ValueError(
-                f"CSV file must contain the following columns: {', '.join(required_columns)}. "
-                f"Missing: {', '.join(missing_columns)}."
+                f"Row {row_index}: Database name mismatch. Expected '{database_name}', "
+                f"found '{row_database}'. All rows must use the same database."
             )
 
-        for row_index, row in enumerate(reader, start=2):  # account for header line
-            categories = _parse_categories(
-                row.get("categories", ""), line_number=row_index
-            )
-            cf = _parse_cf(row.get("cf"), line_number=row_index)
-
-            flow_name = row.get("flow_name", "").strip()
-            code_raw = row.get("code", "").strip()
-            code = code_raw if code_raw else _sanitize_code(flow_name)
-            node_type = row.get("type", "").strip()
-            if not node_type:
-                raise ValueError(
-                    f"Row {row_index}: type column is required and cannot be empty."
-                )
-            # Validate that type is one of the valid Brightway25 values
-            valid_types = {"emission", "natural resource", "process"}
-            if node_type not in valid_types:
-                raise ValueError(
-                    f"Row {row_index}: type must be one of {valid_types}, got '{node_type}'."
-                )
-
-            parsed_rows.append(
-                {
-                    "database": row.get("new_database", "").strip(),
-                    "name": flow_name,
-                    "code": code,
-                    "unit": row.get("unit", "").strip(),
-                    "CAS number": (row.get("CAS number") or "").strip(),
-                    "categories": categories,
-                    "type": node_type,
-                    "cf": cf,
-                }
-            )
+        try:
+            ids.append(node_ids[(row["name"], row["code"])])
+        except KeyError as exc:
+            raise ValueError(
+                f"Row {row_index}: no node named '{row['name']}' with code "
+                f"'{row['code']}' found in database '{database_name}'."
+            ) from exc
+        cfs.append(row["cf"])
 
-    return parsed_rows
+    return np.array(ids, dtype=np.int64), np.array(cfs, dtype=np.float64)
 
 
 def parse_node_ids_and_cfs(path: str | Path) -> list[tuple[int, float]]:
@@ -234,6 +521,8 @@ def parse_node_ids_and_cfs(path: str | Path) -> list[tuple[int, float]]:
 
     This function parses the CSV file, retrieves nodes from the Brightway25 database
     using name and code, and returns a list of tuples containing (node.id, cf).
+    Rows are read lazily and nodes are looked up in an index of the database given in
+    the CSV file, built with a single query and reused until the database is modified.
 
     The database name is read from the "new_database" column in the CSV file.
     The CSV file must contain a "type" column to specify the node type.
@@ -256,82 +545,7 @@ def parse_node_ids_and_cfs(path: str | Path) -> list[tuple[int, float]]:
         If the CSV file does not exist.
     ValueError
         If required columns are missing, if data cannot be parsed correctly,
-        or if the database name is missing or invalid.
+        if the database name is missing or invalid, or if a node cannot be found.
     """
-    csv_path = _coerce_to_path(path)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
-
-    required_columns: Sequence[str] = (
-        "new_database",
-        "flow_name",
-        "code",
-        "unit",
-        "CAS number",
-        "categories",
-        "type",
-        "cf",
-    )
-
-    node_cf_tuples: list[tuple[int, float]] = []
-    database_name: str | None = None
-
-    with csv_path.open(newline="", encoding="utf-8-sig") as csv_file:
-        reader = csv.DictReader(csv_file)
-
-        if reader.fieldnames is None:
-            raise ValueError("CSV file appears to be empty or has no header row.")
-
-        missing_columns = [
-            column for column in required_columns if column not in reader.fieldnames
-        ]
-        if missing_columns:
-            raise ValueError(
-                f"CSV file must contain the following columns: {', '.join(required_columns)}. "
-                f"Missing: {', '.join(missing_columns)}."
-            )
-
-        # Get database name from first row
-        first_row = next(reader, None)
-        if first_row is None:
-            raise ValueError("CSV file is empty (no data rows).")
-
-        database_name = first_row.get("new_database", "").strip()
-        if not database_name:
-            raise ValueError("Database name is missing in the 'new_database' column.")
-
-        # Process first row
-        cf = _parse_cf(first_row.get("cf"), line_number=2)
-        flow_name = first_row.get("flow_name", "").strip()
-        code_raw = first_row.get("code", "").strip()
-        code = code_raw if code_raw else _sanitize_code(flow_name)
-
-        # Get the target node using name and code
-        node = bd.get_node(name=flow_name, code=code)
-        node_cf_tuples.append((node.id, cf))
-
-        # Process remaining rows
-        for row_index, row in enumerate(
-            reader, start=3
-        ):  # start at 3 (header + first row)
-            # Verify database name is consistent
-            row_database = row.get("new_database", "").strip()
-            if row_database != database_name:
-                raise ValueError(
-                    f"Row {row_index}: Database name mismatch. Expected '{database_name}', "
-                    f"found '{row_database}'. All rows must use the same database."
-                )
-
-            cf = _parse_cf(row.get("cf"), line_number=row_index)
-
-            flow_name = row.get("flow_name", "").strip()
-            code_raw = row.get("code", "").strip()
-            code = code_raw if code_raw else _sanitize_code(flow_name)
-
-            # Get the target node using name and code
-            node = bd.get_node(name=flow_name, code=code)
-
-            # Create tuple with node.id and cf value
-            node_cf_tuples.append((node.id, cf))
-
-    return node_cf_tuples
+    node_ids, cfs = parse_node_ids_and_cfs_arrays(path)
+    return list(zip(node_ids.tolist(), cfs.tolist()))
@@ -1,11 +1,32 @@
-"""Tests for the parse_new_flows_from_csv function."""
+"""Tests for the parse_new_flows_from_csv and parse_node_ids_and_cfs functions."""
 
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
+import bw2data as bd
+import numpy as np
 import pytest
+from bw2data.tests import bw2test
 
-from add_new_cfs import parse_new_flows_from_csv
+import add_new_cfs
+from add_new_cfs import (
+    _sanitize_code,
+    parse_new_flows_from_csv,
+    parse_new_flows_from_csv_iter,
+    parse_node_ids_and_cfs,
+    parse_node_ids_and_cfs_arrays,
+)
+
+
+def _write_flows(csv_path: Path) -> list[dict[str, object]]:
+    """Register the flows of a CSV file in their Brightway25 database."""
+    flows = parse_new_flows_from_csv(csv_path)
+    database = bd.Database(flows[0]["database"])
+    database.register()
+    database.write({(flow["database"], flow["code"]): flow for flow in flows})
+    return flows
 
 
 def test_parse_sample_csv(sample_csv_path: Path) -> None:
@@ -69,6 +90,26 @@ def test_parse_csv_with_path_object(sample_csv_path: Path) -> None:
     assert len(result) == 10
 
 
+def test_parse_csv_iter_matches_list(sample_csv_path: Path) -> None:
+    """Test that the lazy parser yields the same rows as the list parser."""
+    rows = parse_new_flows_from_csv_iter(sample_csv_path)
+    assert not isinstance(rows, list)
+    assert list(rows) == parse_new_flows_from_csv(sample_csv_path)
+
+
+def test_parse_large_csv_buffered(sample_csv_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that files read through the large buffer parse the same rows."""
+    expected = parse_new_flows_from_csv(sample_csv_path)
+    monkeypatch.setattr(add_new_cfs, "_LARGE_FILE_SIZE", 0)
+    assert parse_new_flows_from_csv(sample_csv_path) == expected
+
+
+def test_missing_file_iter() -> None:
+    """Test that FileNotFoundError is raised before iterating for a non-existent file."""
+    with pytest.raises(FileNotFoundError, match="CSV file not found"):
+        parse_new_flows_from_csv_iter("nonexistent_file.csv")
+
+
 def test_missing_file() -> None:
     """Test that FileNotFoundError is raised for non-existent file."""
     with pytest.raises(FileNotFoundError, match="CSV file not found"):
@@ -91,6 +132,22 @@ additional_chemical_flows,Test Substance,test_substance,kg,123-45-6,water::surfa
         temp_path.unlink()
 
 
+def test_missing_required_columns_listed_in_order() -> None:
+    """Test that all missing columns are reported, in the documented column order."""
+    csv_content = """flow_name,code,CAS number,categories,type
+Test Substance,test_substance,123-45-6,water::surface water::freshwater,emission
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = Path(f.name)
+
+    try:
+        with pytest.raises(ValueError, match="Missing: new_database, unit, cf\\.$"):
+            parse_new_flows_from_csv(temp_path)
+    finally:
+        temp_path.unlink()
+
+
 def test_invalid_cf_value() -> None:
     """Test that ValueError is raised for invalid CF values."""
     csv_content = """new_database,flow_name,code,unit,CAS number,categories,type,cf
@@ -107,6 +164,53 @@ additional_chemical_flows,Test Substance,test_substance,kg,123-45-6,water::surfa
         temp_path.unlink()
 
 
+def test_cf_value_forms_accepted_by_float() -> None:
+    """Test that padded, signed and special CF values are parsed like float does."""
+    raw_cfs = [" 1.5E-05 ", "-2", "+.5", "nan", "inf"]
+    header = "new_database,flow_name,code,unit,CAS number,categories,type,cf\n"
+    rows = "".join(
+        f"additional_chemical_flows,Substance {i},,kg,,water,emission,{raw}\n"
+        for i, raw in enumerate(raw_cfs)
+    )
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(header + rows)
+        temp_path = Path(f.name)
+
+    try:
+        result = parse_new_flows_from_csv(temp_path)
+        assert [repr(row["cf"]) for row in result] == [repr(float(raw)) for raw in raw_cfs]
+    finally:
+        temp_path.unlink()
+
+
+def test_invalid_cf_value_reports_row() -> None:
+    """Test that the row of an invalid CF value is reported after a valid row."""
+    csv_content = """new_database,flow_name,code,unit,CAS number,categories,type,cf
+additional_chemical_flows,Test Substance,test_substance,kg,123-45-6,water::surface water::freshwater,emission,1.0E-05
+additional_chemical_flows,Other Substance,other_substance,kg,123-45-7,water::surface water::freshwater,emission,not_a_number
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        temp_path = Path(f.name)
+
+    try:
+        with pytest.raises(ValueError, match="Row 3: cf column must contain a floating point value"):
+            parse_new_flows_from_csv(temp_path)
+    finally:
+        temp_path.unlink()
+
+
+def test_import_does_not_load_numpy_or_bw2data() -> None:
+    """Test that importing the module for CSV parsing does not import numpy or bw2data."""
+    code = (
+        "import sys; import add_new_cfs; "
+        "assert 'numpy' not in sys.modules and 'bw2data' not in sys.modules"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=Path(add_new_cfs.__file__).parent
+    )
+
+
 def test_categories_parsing() -> None:
     """Test that categories are correctly parsed into tuples."""
     csv_content = """new_database,flow_name,code,unit,CAS number,categories,type,cf
@@ -160,6 +264,41 @@ additional_chemical_flows,Another Test,another_test,kg,123-45-6,water::surface w
         temp_path.unlink()
 
 
+def test_code_sanitization_other_whitespace() -> None:
+    """Test that tabs and non-breaking spaces in flow_name are replaced in the code."""
+    csv_content = """new_database,flow_name,code,unit,CAS number,categories,type,cf
+additional_chemical_flows,Test\tSubstance\xa0Name,,kg,123-45-6,water::surface water::freshwater,emission,1.0E-05
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+        f.write(csv_content)
+        temp_path = Path(f.name)
+
+    try:
+        result = parse_new_flows_from_csv(temp_path)
+        assert result[0]["code"] == "Test_Substance_Name"
+    finally:
+        temp_path.unlink()
+
+
+def test_sanitize_code_matches_row_parsing() -> None:
+    """Test that _sanitize_code gives the codes derived while parsing rows."""
+    flow_names = ["Ibuprofen", "Test Substance", "Test\tSubstance\xa0Name", "A  B"]
+    header = "new_database,flow_name,code,unit,CAS number,categories,type,cf\n"
+    rows = "".join(
+        f"additional_chemical_flows,{name},,kg,,water,emission,1.0\n" for name in flow_names
+    )
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+        f.write(header + rows)
+        temp_path = Path(f.name)
+
+    try:
+        result = parse_new_flows_from_csv(temp_path)
+        assert [row["code"] for row in result] == [_sanitize_code(name) for name in flow_names]
+        assert _sanitize_code(" Test\tSubstance\xa0Name ") == "Test_Substance_Name"
+    finally:
+        temp_path.unlink()
+
+
 def test_all_medical_substances_have_required_fields(sample_csv_path: Path) -> None:
     """Test that all parsed medical substances have all required fields."""
     result = parse_new_flows_from_csv(sample_csv_path)
@@ -177,3 +316,75 @@ def test_all_medical_substances_have_required_fields(sample_csv_path: Path) -> N
         assert isinstance(substance["type"], str)
         assert isinstance(substance["cf"], float)
 
+
+@bw2test
+def test_parse_node_ids_and_cfs(sample_csv_path: Path) -> None:
+    """Test that node ids and CFs are returned for every row, in CSV order."""
+    flows = _write_flows(sample_csv_path)
+
+    result = parse_node_ids_and_cfs(sample_csv_path)
+
+    assert len(result) == 10
+    for (node_id, cf), flow in zip(result, flows):
+        node = bd.get_node(id=node_id)
+        assert node["name"] == flow["name"]
+        assert node["code"] == flow["code"]
+        assert cf == flow["cf"]
+
+
+@bw2test
+def test_parse_node_ids_and_cfs_arrays(sample_csv_path: Path) -> None:
+    """Test that the arrays hold the same node ids and CFs as the list of tuples."""
+    _write_flows(sample_csv_path)
+
+    node_ids, cfs = parse_node_ids_and_cfs_arrays(sample_csv_path)
+
+    assert node_ids.dtype == np.int64
+    assert cfs.dtype == np.float64
+    assert node_ids.flags.c_contiguous and cfs.flags.c_contiguous
+    assert list(zip(node_ids.tolist(), cfs.tolist())) == parse_node_ids_and_cfs(sample_csv_path)
+
+
+@bw2test
+def test_parse_node_ids_and_cfs_database_mismatch(sample_csv_path: Path) -> None:
+    """Test that ValueError is raised when rows use different databases."""
+    _write_flows(sample_csv_path)
+    csv_content = sample_csv_path.read_text(encoding="utf-8")
+    lines = csv_content.splitlines()
+    lines[3] = lines[3].replace("additional_chemical_flows", "other_flows", 1)
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write("\n".join(lines) + "\n")
+        temp_path = Path(f.name)
+
+    try:
+        with pytest.raises(ValueError, match="Row 4: Database name mismatch"):
+            parse_node_ids_and_cfs(temp_path)
+    finally:
+        temp_path.unlink()
+
+
+@bw2test
+def test_parse_node_ids_and_cfs_missing_node(sample_csv_path: Path) -> None:
+    """Test that ValueError is raised when a row has no matching node."""
+    database = bd.Database("additional_chemical_flows")
+    database.register()
+    database.write({})
+
+    with pytest.raises(ValueError, match="Row 2: no node named 'Acetaminophen'"):
+        parse_node_ids_and_cfs(sample_csv_path)
+
+
+@bw2test
+def test_parse_node_ids_and_cfs_reuses_index(sample_csv_path: Path) -> None:
+    """Test that the database index is reused, and rebuilt once the database is written."""
+    flows = _write_flows(sample_csv_path)
+    first = parse_node_ids_and_cfs(sample_csv_path)
+    hits = add_new_cfs._db_index.cache_info().hits
+    assert parse_node_ids_and_cfs(sample_csv_path) == first
+    assert add_new_cfs._db_index.cache_info().hits == hits + 1
+
+    bd.Database(flows[0]["database"]).write(
+        {(flow["database"], flow["code"]): flow for flow in flows[:-1]}
+    )
+    with pytest.raises(ValueError, match="Row 11: no node named 'Warfarin'"):
+        parse_node_ids_and_cfs(sample_csv_path)